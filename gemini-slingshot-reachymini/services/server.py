@@ -10,40 +10,167 @@ Endpoints:
 - GET  /api/events   - View recent events
 - DELETE /api/events - Clear events history
 - POST /api/events   - Receive game events
+- POST /api/events/batch - Receive several game events at once
 """
 
 import os
-import json
+import logging
+import time
 import uuid
+from itertools import count
+from collections import deque
 from datetime import datetime
+import orjson
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from waitress import serve
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Route request.get_json() and jsonify() through orjson.
+
+    Only dumps/loads are overridden. Options orjson can express (indent=2,
+    compact separators, sort_keys, default) are mapped; any other
+    json.dumps/json.loads option falls back to the stdlib implementation.
+    """
+
+    sort_keys = False
+    ensure_ascii = False  # orjson always emits UTF-8
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.get('indent')
+        separators = kwargs.get('separators')
+        if (kwargs.keys() - {'indent', 'separators', 'sort_keys', 'default'}
+                or indent not in (None, 2)
+                or separators not in (None, (',', ':'))):
+            return super().dumps(obj, **kwargs)
+
+        # Let Flask's default() format dates and dataclasses, as with json
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 PORT = int(os.environ.get('PORT', 3001))
+THREADS = int(os.environ.get('THREADS', 8))
+# LOG_LEVEL=DEBUG also dumps every received event
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# FLASK_DEBUG=1 falls back to the Werkzeug dev server (auto-reload, debugger)
+DEBUG = os.environ.get('FLASK_DEBUG') == '1'
+
+logging.basicConfig(format='%(message)s')
+logger = logging.getLogger('reachy')
+logger.setLevel(LOG_LEVEL)
 
 # Store recent events for debugging
-recent_events = []
 MAX_EVENTS = 100
-
-
-def add_event(event):
-    """Add event to history, maintaining max size."""
-    recent_events.append(event)
-    if len(recent_events) > MAX_EVENTS:
-        recent_events.pop(0)
+MAX_BATCH_SIZE = 100
+recent_events = deque(maxlen=MAX_EVENTS)
+
+# Event ids are "<receive ms>-<boot id>-<hex sequence>". BOOT_ID is random
+# per process, so ids stay unique across workers and restarts; next() on
+# count is atomic.
+BOOT_ID = uuid.uuid4().hex[:8]
+event_ids = count()
+# Bumped on every history change; with BOOT_ID, the deque history's ETag
+history_versions = count()
+history_version = next(history_versions)
+
+# With REDIS_URL set (needs the redis package), history lives in a Redis
+# stream instead, so every worker process sees the same events.
+REDIS_URL = os.environ.get('REDIS_URL')
+EVENTS_STREAM = 'reachy:events'
+if REDIS_URL:
+    import redis
+    redis_client = redis.Redis.from_url(REDIS_URL)
+else:
+    redis_client = None
+
+
+def add_events(events):
+    """Add events to history, keeping at most (about) MAX_EVENTS."""
+    global history_version
+    if redis_client is None:
+        recent_events.extend(events)
+        history_version = next(history_versions)
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    for event in events:
+        pipe.xadd(EVENTS_STREAM, {'event': orjson.dumps(event)},
+                  maxlen=MAX_EVENTS, approximate=True)
+    pipe.execute()
+
+
+def list_events():
+    """Return the recent events, oldest first."""
+    if redis_client is None:
+        return list(recent_events)
+    entries = redis_client.xrevrange(EVENTS_STREAM, count=MAX_EVENTS)
+    return [orjson.loads(fields[b'event']) for _, fields in reversed(entries)]
+
+
+def count_events():
+    """Number of events currently held in history."""
+    if redis_client is None:
+        return len(recent_events)
+    return min(redis_client.xlen(EVENTS_STREAM), MAX_EVENTS)
+
+
+def clear_history():
+    """Forget all recorded events."""
+    global history_version
+    if redis_client is None:
+        recent_events.clear()
+        history_version = next(history_versions)
+    else:
+        redis_client.delete(EVENTS_STREAM)
+
+
+def history_etag():
+    """ETag for the current history; changes whenever events are added or cleared."""
+    if redis_client is None:
+        # BOOT_ID: a restarted server's v1, v2... never match old tags
+        return f"{BOOT_ID}-v{history_version}"
+    # Stream ids only grow, even across a DELETE
+    latest = redis_client.xrevrange(EVENTS_STREAM, count=1)
+    return latest[0][0].decode() if latest else "empty"
+
+
+def events_after(events, since_id):
+    """Events received after since_id; all of them if since_id is unknown."""
+    for i in range(len(events) - 1, -1, -1):
+        if events[i]['id'] == since_id:
+            return events[i + 1:]
+    return events
+
+
+RULE = '=' * 60
+SHORT_RULE = '=' * 20
 
 
 def log_event(event_type, timestamp, data):
-    """Print event to console with formatted output."""
-    print(f"\n{'='*60}")
-    print(f"{'='*20} [{event_type.upper()}] {'='*20}")
-    print(f"{'='*60}")
-    print(f"   Time: {timestamp}")
-    print(f"   Data: {json.dumps(data, indent=2, ensure_ascii=False)}")
-    print(f"{'='*60}\n")
+    """Dump event to the debug log; skipped entirely unless LOG_LEVEL=DEBUG."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    # One record, so the handler lock is taken once per event
+    logger.debug(
+        f"\n{RULE}\n{SHORT_RULE} [{str(event_type).upper()}] {SHORT_RULE}\n{RULE}\n"
+        f"   Time: {timestamp}\n"
+        f"   Data: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}\n"
+        f"{RULE}\n"
+    )
 
 
 # ========================================================================
@@ -56,11 +183,11 @@ def handle_slingshot_draw(data):
     drag_distance = data.get('dragDistance', 0)
     angle = data.get('angle', 0)
 
-    print(f"   🤖 [DRAW] Power: {power_percent}%, Distance: {drag_distance}, Angle: {angle:.2f} rad")
+    logger.info(f"   🤖 [DRAW] Power: {power_percent}%, Distance: {drag_distance}, Angle: {angle:.2f} rad")
 
     # High power draw (> 70%) - robot gets excited
     if data.get('powerRatio', 0) > 0.7:
-        print("   🤖 Robot: High power detected - preparing for big shot!")
+        logger.info("   🤖 Robot: High power detected - preparing for big shot!")
         # TODO: Send command to ReachyMini
         # await reachy_mini.animate('anticipation_high')
 
@@ -71,12 +198,12 @@ def handle_slingshot_fire(data):
     velocity = data.get('velocity', {})
     color = data.get('color', 'unknown')
 
-    print(f"   🤖 [FIRE] Power: {power_percent}%, Color: {color}")
-    print(f"   🤖 [FIRE] Velocity: vx={velocity.get('vx', 0):.1f}, vy={velocity.get('vy', 0):.1f}")
+    logger.info(f"   🤖 [FIRE] Power: {power_percent}%, Color: {color}")
+    logger.info(f"   🤖 [FIRE] Velocity: vx={velocity.get('vx', 0):.1f}, vy={velocity.get('vy', 0):.1f}")
 
     # Power shot (> 80%) - robot watches intensely
     if data.get('powerRatio', 0) > 0.8:
-        print("   🤖 Robot: Power shot! Tracking trajectory...")
+        logger.info("   🤖 Robot: Power shot! Tracking trajectory...")
         # TODO: Send command to ReachyMini
         # await reachy_mini.animate('watch_intense')
 
@@ -86,7 +213,7 @@ def handle_ball_collision(data):
     hit_color = data.get('hitBubbleColor', 'unknown')
     collision_pos = data.get('collisionPosition', {})
 
-    print(f"   🤖 [COLLISION] Hit {hit_color} bubble at ({collision_pos.get('x', 0)}, {collision_pos.get('y', 0)})")
+    logger.info(f"   🤖 [COLLISION] Hit {hit_color} bubble at ({collision_pos.get('x', 0)}, {collision_pos.get('y', 0)})")
     # TODO: Send command to ReachyMini
     # await reachy_mini.animate('flinch')
 
@@ -97,14 +224,14 @@ def handle_bubble_eliminated(data):
     color_label = data.get('colorLabel', 'Unknown')
     points = data.get('totalPoints', 0)
 
-    print(f"   🤖 [ELIMINATED] {count} {color_label} bubbles, {points} pts")
+    logger.info(f"   🤖 [ELIMINATED] {count} {color_label} bubbles, {points} pts")
 
     if count >= 5:
-        print("   🤖 Robot: Big combo! Celebrating!")
+        logger.info("   🤖 Robot: Big combo! Celebrating!")
         # TODO: Send command to ReachyMini
         # await reachy_mini.animate('celebrate_combo')
     elif count >= 3:
-        print("   🤖 Robot: Nice shot!")
+        logger.info("   🤖 Robot: Nice shot!")
         # TODO: Send command to ReachyMini
         # await reachy_mini.animate('nod_approval')
 
@@ -116,82 +243,149 @@ def handle_game_win(data):
     duration_ms = data.get('duration', 0)
     duration_sec = round(duration_ms / 1000)
 
-    print(f"   🤖 [GAME WIN] Score: {final_score}, Shots: {shots_fired}, Time: {duration_sec}s")
-    print("   🤖 Robot: 🎉 VICTORY DANCE! 🎉")
+    logger.info(f"   🤖 [GAME WIN] Score: {final_score}, Shots: {shots_fired}, Time: {duration_sec}s")
+    logger.info("   🤖 Robot: 🎉 VICTORY DANCE! 🎉")
     # TODO: Send command to ReachyMini
     # await reachy_mini.animate('victory')
 
 
+HANDLERS = {
+    'slingshot_draw': handle_slingshot_draw,
+    'slingshot_fire': handle_slingshot_fire,
+    'ball_collision': handle_ball_collision,
+    'bubble_eliminated': handle_bubble_eliminated,
+    'game_win': handle_game_win,
+}
+
+
 # ========================================================================
 # API ENDPOINTS
 # ========================================================================
 
+# Static parts of frequent responses, encoded once
+HEALTH_PREFIX = b'{"status":"ok","uptime":0,"eventsReceived":'  # TODO: Implement actual uptime tracking
+HEALTH_MID = b',"timestamp":"'
+HEALTH_SUFFIX = b'"}'
+CLEARED_BODY = orjson.dumps({'status': 'cleared'})
+
+
+def json_response(body):
+    """Wrap already-encoded JSON bytes in a response."""
+    return app.response_class(body, mimetype='application/json')
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    uptime_seconds = 0  # TODO: Implement actual uptime tracking
-    return jsonify({
-        'status': 'ok',
-        'timestamp': datetime.now().isoformat(),
-        'uptime': uptime_seconds,
-        'eventsReceived': len(recent_events)
-    })
+    return json_response(
+        HEALTH_PREFIX + str(count_events()).encode()
+        + HEALTH_MID + datetime.now().isoformat().encode() + HEALTH_SUFFIX
+    )
 
 
 @app.route('/api/events', methods=['GET'])
 def get_events():
-    """Get recent events."""
-    return jsonify({
-        'count': len(recent_events),
-        'events': recent_events
-    })
+    """Get recent events.
+
+    ?since_id=<id> returns only events received after that id. Responses
+    carry a weak ETag, so polling with If-None-Match gets 304 when nothing
+    changed.
+    """
+    etag = history_etag()
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        events = list_events()
+        since_id = request.args.get('since_id')
+        if since_id:
+            events = events_after(events, since_id)
+        response = jsonify({
+            'count': len(events),
+            'events': events
+        })
+    response.set_etag(etag, weak=True)
+    return response
 
 
 @app.route('/api/events', methods=['DELETE'])
 def clear_events():
     """Clear events history."""
-    recent_events.clear()
-    return jsonify({'status': 'cleared'})
+    clear_history()
+    return json_response(CLEARED_BODY)
+
+
+def build_event(body, now_ms, received_at):
+    """Wrap a raw event payload with a server-side id and receive time."""
+    return {
+        'id': f"{now_ms}-{BOOT_ID}-{next(event_ids):x}",
+        'eventType': body.get('eventType'),
+        'timestamp': body.get('timestamp'),
+        'data': body.get('data', {}),
+        'receivedAt': received_at
+    }
+
+
+def dispatch_event(event):
+    """Run the handler for an event. Returns False if the handler raised."""
+    event_type = event['eventType']
+    try:
+        handler = HANDLERS.get(event_type)
+        if handler:
+            handler(event['data'])
+        else:
+            logger.warning(f"   ⚠️ Unknown event type: {event_type}")
+    except Exception as e:
+        logger.error(f"   ❌ Error handling {event_type}: {e}")
+        return False
+    return True
+
+
+def process_events(bodies):
+    """Record, log and dispatch a list of raw event payloads.
+
+    Returns the built events and the number whose handler failed.
+    """
+    # One clock read per request, shared by every event in a batch
+    now_ns = time.time_ns()
+    now_ms = now_ns // 1_000_000
+    # Always microsecond precision, matching datetime.now().isoformat()
+    received_at = datetime.fromtimestamp(now_ns // 1_000_000_000).replace(
+        microsecond=now_ns // 1000 % 1_000_000).isoformat(timespec='microseconds')
+    events = [build_event(body, now_ms, received_at) for body in bodies]
+    add_events(events)
+
+    failed = 0
+    for event in events:
+        log_event(event['eventType'], event['timestamp'], event['data'])
+        if not dispatch_event(event):
+            failed += 1
+    return events, failed
 
 
 @app.route('/api/events', methods=['POST'])
 def receive_event():
     """Main event receiver endpoint."""
     body = request.get_json()
-    event_type = body.get('eventType')
-    timestamp = body.get('timestamp')
-    data = body.get('data', {})
-
-    event = {
-        'id': f"{int(datetime.now().timestamp() * 1000)}-{uuid.uuid4().hex[:9]}",
-        'eventType': event_type,
-        'timestamp': timestamp,
-        'data': data,
-        'receivedAt': datetime.now().isoformat()
-    }
+    events, _ = process_events([body])
+    return jsonify({'status': 'received', 'eventId': events[0]['id']})
 
-    add_event(event)
-    log_event(event_type, timestamp, data)
 
-    # Process event based on type
-    try:
-        handlers = {
-            'slingshot_draw': handle_slingshot_draw,
-            'slingshot_fire': handle_slingshot_fire,
-            'ball_collision': handle_ball_collision,
-            'bubble_eliminated': handle_bubble_eliminated,
-            'game_win': handle_game_win,
-        }
-
-        handler = handlers.get(event_type)
-        if handler:
-            handler(data)
-        else:
-            print(f"   ⚠️ Unknown event type: {event_type}")
-    except Exception as e:
-        print(f"   ❌ Error handling {event_type}: {e}")
+@app.route('/api/events/batch', methods=['POST'])
+def receive_events_batch():
+    """Receive several game events in one request: {"events": [...]}."""
+    body = request.get_json(cache=False)
+    bodies = body.get('events') if isinstance(body, dict) else None
+    if not isinstance(bodies, list) or not all(isinstance(b, dict) for b in bodies):
+        return jsonify({'error': "expected a JSON object with an 'events' list"}), 400
+    if len(bodies) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'batch too large (max {MAX_BATCH_SIZE} events)'}), 413
 
-    return jsonify({'status': 'received', 'eventId': event['id']})
+    events, failed = process_events(bodies)
+    return jsonify({
+        'processed': len(events),
+        'failed': failed,
+        'ids': [event['id'] for event in events]
+    })
 
 
 # ========================================================================
@@ -213,9 +407,13 @@ if __name__ == '__main__':
 ║    GET  /api/events   - View recent events                ║
 ║    DELETE /api/events - Clear events history              ║
 ║    POST /api/events   - Receive game events               ║
+║    POST /api/events/batch - Receive batched game events   ║
 ║                                                            ║
 ║  Waiting for game events...                               ║
 ║                                                            ║
 ╚════════════════════════════════════════════════════════════╝
 """)
-    app.run(host='0.0.0.0', port=PORT, debug=True)
+    if DEBUG:
+        app.run(host='0.0.0.0', port=PORT, debug=True)
+    else:
+        serve(app, host='0.0.0.0', port=PORT, threads=THREADS)
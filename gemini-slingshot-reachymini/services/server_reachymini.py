@@ -13,36 +13,114 @@ Prerequisites:
 """
 
 import os
-import json
-import uuid
+import logging
+from itertools import count
+from collections import deque
 import math
+import uuid
 import threading
 import time
 from datetime import datetime
+import orjson
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from waitress import serve
 
 from reachy_mini import ReachyMini
 from reachy_mini.utils import create_head_pose
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Route request.get_json() and jsonify() through orjson.
+
+    Only dumps/loads are overridden. Options orjson can express (indent=2,
+    compact separators, sort_keys, default) are mapped; any other
+    json.dumps/json.loads option falls back to the stdlib implementation.
+    """
+
+    sort_keys = False
+    ensure_ascii = False  # orjson always emits UTF-8
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.get('indent')
+        separators = kwargs.get('separators')
+        if (kwargs.keys() - {'indent', 'separators', 'sort_keys', 'default'}
+                or indent not in (None, 2)
+                or separators not in (None, (',', ':'))):
+            return super().dumps(obj, **kwargs)
+
+        # Let Flask's default() format dates and dataclasses, as with json
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 PORT = int(os.environ.get('PORT', 3001))
+THREADS = int(os.environ.get('THREADS', 8))
+# LOG_LEVEL=DEBUG also dumps every received event
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# FLASK_DEBUG=1 falls back to the Werkzeug dev server (auto-reload, debugger)
+DEBUG = os.environ.get('FLASK_DEBUG') == '1'
 
-recent_events = []
-MAX_EVENTS = 100
+logging.basicConfig(format='%(message)s')
+logger = logging.getLogger('reachy')
+logger.setLevel(LOG_LEVEL)
 
-# Robot state
+MAX_EVENTS = 100
+MAX_BATCH_SIZE = 100
+recent_events = deque(maxlen=MAX_EVENTS)
+
+# Event ids are "<receive ms>-<boot id>-<hex sequence>". BOOT_ID is random
+# per process, so ids stay unique across workers and restarts; next() on
+# count is atomic.
+BOOT_ID = uuid.uuid4().hex[:8]
+event_ids = count()
+# Bumped on every history change; with BOOT_ID, the deque history's ETag
+history_versions = count()
+history_version = next(history_versions)
+
+# With REDIS_URL set (needs the redis package), history lives in a Redis
+# stream instead, so every worker process sees the same events.
+REDIS_URL = os.environ.get('REDIS_URL')
+EVENTS_STREAM = 'reachy:events'
+if REDIS_URL:
+    import redis
+    redis_client = redis.Redis.from_url(REDIS_URL)
+else:
+    redis_client = None
+
+# Robot state. Mode changes happen under motion_lock (declared below), and
+# the idle/draw loops hold it from checking the mode to sending, so a pose
+# for a stale mode can never land after a newer one. HTTP reads lock-free.
 robot_state = {
-    'mode': 'idle',  # idle, drawing, fired
-    'power_level': 0.0,
-    'animating': False  # Busy with animation, ignore events
+    'mode': 'idle',  # idle, drawing, fired, celebrating
+    'power_level': 0.0,  # Latest draw power, applied by the draw sampler
 }
+animating = threading.Event()  # Busy with animation, ignore events
+drawing = threading.Event()  # Set while mode == 'drawing'; wakes the draw sampler
 
 idle_thread_running = True
-idle_lock = threading.Lock()
+
+# Event handlers run on a motion worker thread, not on the HTTP thread
+MOTION_QUEUE_SIZE = 32
+pending_motions = deque()  # (handler, data); guarded by motion_ready
+motion_ready = threading.Condition()
+
+# Every robot write (worker, idle loop, draw sampler) holds this lock
+motion_lock = threading.RLock()
 
 # Static head pose - never changes (camera stability)
 STATIC_HEAD_POSE = create_head_pose(
@@ -51,104 +129,219 @@ STATIC_HEAD_POSE = create_head_pose(
     degrees=True, mm=True
 )
 
+# Antenna pairs passed to the robot are shared, never mutated
+NEUTRAL_ANTENNAS = [0.0, 0.0]
+
 # Robot instance
 robot = ReachyMini(media_backend='no_media')
-print("✅ ReachyMini initialized")
+logger.info("✅ ReachyMini initialized")
 
 
 # ========================================================================
 # MOTION CONTROL
 # ========================================================================
 
+# Circuit breaker: after MOTION_FAILURE_LIMIT errors in a row (e.g. daemon
+# gone), robot calls are skipped for MOTION_BACKOFF seconds.
+MOTION_FAILURE_LIMIT = 5
+MOTION_BACKOFF = 1.0
+motion_failures = 0
+motion_paused_until = 0.0
+
+
+def motion_paused():
+    return motion_paused_until and time.monotonic() < motion_paused_until
+
+
+def motion_failed(e):
+    """Count a failed robot call; trip the breaker when failures pile up.
+
+    The count stays at the limit until motion_ok(), so once tripped a
+    single failing probe after each backoff re-opens the breaker.
+    Call with motion_lock held.
+    """
+    global motion_failures, motion_paused_until
+    if motion_failures < MOTION_FAILURE_LIMIT:
+        motion_failures += 1
+        if motion_failures < MOTION_FAILURE_LIMIT:
+            return
+        logger.warning(f"   ⚠️ Robot not responding ({e}) - pausing motion until it recovers")
+    motion_paused_until = time.monotonic() + MOTION_BACKOFF
+
+
+def motion_ok():
+    """Close the breaker after a successful call. Call with motion_lock held."""
+    global motion_failures, motion_paused_until
+    motion_failures = 0
+    motion_paused_until = 0.0
+
+
+def send_motion(move, **target):
+    """Send one robot command; return True if it reached the robot.
+
+    The breaker check, the call and the failure bookkeeping all run under
+    motion_lock, since the idle, draw and motion worker threads share them.
+    """
+    with motion_lock:
+        if motion_paused():
+            return False
+        try:
+            move(head=STATIC_HEAD_POSE, **target)
+        except Exception as e:
+            motion_failed(e)  # Keep animating; the breaker handles a dead robot
+            return False
+        if motion_failures or motion_paused_until:
+            motion_ok()
+        return True
+
+
 def goto_antennas(left_deg, right_deg, duration=0.15):
-    """Move antennas with smooth interpolation."""
-    try:
-        left_rad = math.radians(left_deg)
-        right_rad = math.radians(right_deg)
-
-        robot.goto_target(
-            head=STATIC_HEAD_POSE,
-            antennas=[left_rad, right_rad],
-            duration=duration
-        )
-    except Exception as e:
-        pass  # Ignore errors for smooth animation
+    """Move antennas with smooth interpolation. Returns True if sent."""
+    return send_motion(
+        robot.goto_target,
+        antennas=[math.radians(left_deg), math.radians(right_deg)],
+        duration=duration
+    )
 
 
 def set_antennas(left_deg, right_deg):
-    """Set antenna angles immediately (for instant response)."""
-    try:
-        left_rad = math.radians(left_deg)
-        right_rad = math.radians(right_deg)
+    """Set antenna angles immediately (for instant response). Returns True if sent."""
+    return set_antennas_rad([math.radians(left_deg), math.radians(right_deg)])
 
-        robot.set_target(
-            head=STATIC_HEAD_POSE,
-            antennas=[left_rad, right_rad]
-        )
-    except Exception as e:
-        pass
+
+def set_antennas_rad(antennas):
+    """Same as set_antennas, for a ready-made [left, right] pair in radians."""
+    return send_motion(robot.set_target, antennas=antennas)
 
 
 def goto_body(body_yaw_deg, duration=0.3):
-    """Rotate body smoothly."""
-    try:
-        body_yaw_rad = math.radians(body_yaw_deg)
-
-        robot.goto_target(
-            head=STATIC_HEAD_POSE,
-            antennas=[0, 0],
-            body_yaw=body_yaw_rad,
-            duration=duration
-        )
-    except Exception as e:
-        pass
+    """Rotate body smoothly. Returns True if sent."""
+    return send_motion(
+        robot.goto_target,
+        antennas=NEUTRAL_ANTENNAS,
+        body_yaw=math.radians(body_yaw_deg),
+        duration=duration
+    )
 
 
 # ========================================================================
 # IDLE ANIMATION - antennas breathe open/close
 # ========================================================================
 
+IDLE_PERIOD = 0.08  # ~12 FPS
+
+
+def wait_next_tick(next_tick, period):
+    """Sleep until next_tick + period and return that deadline.
+
+    Deadlines (not fixed sleeps) keep the loop at a steady rate; after an
+    overrun the beat restarts from now instead of bursting to catch up.
+    """
+    next_tick += period
+    delay = next_tick - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+        return next_tick
+    return time.monotonic()
+
+
+# One full breathing cycle, precomputed as [left, right] radians pairs.
+# Breathing: antennas open/close (opposite directions)
+# Left: -25° to +25°, Right: +25° to -25°
+IDLE_STEPS = round(2 * math.pi / 0.1)  # ~0.1 rad per frame - moderate speed
+IDLE_TABLE = tuple(
+    [math.radians(25 * math.sin(2 * math.pi * i / IDLE_STEPS)),
+     math.radians(-25 * math.sin(2 * math.pi * i / IDLE_STEPS))]
+    for i in range(IDLE_STEPS)
+)
+
+
 def idle_animation_loop():
     """Antennas breathe open/close continuously."""
     global idle_thread_running
 
     phase = 0
+    next_tick = time.monotonic()
     while idle_thread_running:
-        with idle_lock:
+        with motion_lock:
             if robot_state['mode'] == 'idle':
-                # Breathing: antennas open/close (opposite directions)
-                # Left: -25° to +25°, Right: +25° to -25°
-                phase += 0.1  # Moderate speed
-                angle = math.sin(phase) * 25
+                phase = (phase + 1) % IDLE_STEPS
 
                 # Use set_target for immediate, smooth response
-                set_antennas(angle, -angle)
+                set_antennas_rad(IDLE_TABLE[phase])
 
-        time.sleep(0.08)  # ~12 FPS
+        next_tick = wait_next_tick(next_tick, IDLE_PERIOD)
 
 
 idle_thread = threading.Thread(target=idle_animation_loop, daemon=True)
 idle_thread.start()
-print("✅ Idle animation started")
+logger.info("✅ Idle animation started")
+
+
+# ========================================================================
+# DRAW SAMPLER - antennas follow the latest pull-back power
+# ========================================================================
+
+DRAW_SAMPLE_PERIOD = 0.016  # ~60 Hz
+DRAW_EPSILON = 0.01  # Ignore power changes smaller than 1%
+# Antenna angle at full power, in radians so per-frame work is one multiply
+DRAW_FOLD_RAD = math.radians(40)
+FIRE_SPREAD_RAD = math.radians(50)
+
+
+def draw_sampler_loop():
+    """Sample robot_state['power_level'] while drawing; skip unchanged values.
+
+    Sleeps on the drawing Event outside drawing mode, so it only ticks
+    at DRAW_SAMPLE_PERIOD during a pull-back.
+    """
+    while idle_thread_running:
+        drawing.wait()
+        last_power = None
+        next_tick = time.monotonic()
+        while drawing.is_set():
+            with motion_lock:
+                if robot_state['mode'] != 'drawing':
+                    break
+                power_ratio = robot_state['power_level']
+                if last_power is None or abs(power_ratio - last_power) > DRAW_EPSILON:
+                    # Antennas fold INWARD: left negative, right positive
+                    angle = power_ratio * DRAW_FOLD_RAD
+                    if set_antennas_rad([-angle, angle]):
+                        last_power = power_ratio
+
+            next_tick = wait_next_tick(next_tick, DRAW_SAMPLE_PERIOD)
+
+
+draw_thread = threading.Thread(target=draw_sampler_loop, daemon=True)
+draw_thread.start()
+logger.info("✅ Draw sampler started")
 
 
 # ========================================================================
 # EVENT HANDLERS
 # ========================================================================
 
+def set_mode(mode):
+    """Switch robot mode; call with motion_lock held."""
+    robot_state['mode'] = mode
+    if mode == 'drawing':
+        drawing.set()
+    else:
+        drawing.clear()
+
+
 def handle_slingshot_draw(data):
     """Drawing - antennas fold inward."""
     power_ratio = data.get('powerRatio', 0)
     power_percent = round(power_ratio * 100)
 
-    print(f"   🤖 [DRAW] Power: {power_percent}%")
-
-    with idle_lock:
-        robot_state['mode'] = 'drawing'
+    logger.info(f"   🤖 [DRAW] Power: {power_percent}%")
 
-    # Antennas fold INWARD: left negative, right positive
-    angle = power_ratio * 40
-    set_antennas(-angle, angle)
+    # Latest value wins - the draw sampler moves the antennas
+    with motion_lock:
+        robot_state['power_level'] = power_ratio
+        set_mode('drawing')
 
 
 def handle_slingshot_fire(data):
@@ -156,144 +349,298 @@ def handle_slingshot_fire(data):
     power_ratio = data.get('powerRatio', 0)
     power_percent = round(power_ratio * 100)
 
-    print(f"   🤖 [FIRE] Power: {power_percent}%")
-
-    with idle_lock:
-        robot_state['mode'] = 'fired'
+    logger.info(f"   🤖 [FIRE] Power: {power_percent}%")
 
     # Antennas spread OUTWARD: left positive, right negative
-    angle = power_ratio * 50
-    set_antennas(angle, -angle)
+    angle = power_ratio * FIRE_SPREAD_RAD
+    with motion_lock:
+        set_mode('fired')
+        robot_state['power_level'] = 0.0
+        set_antennas_rad([angle, -angle])
 
-    # Return to idle after delay
+    # Return to idle after delay, unless a newer gesture took over
     def return_to_idle():
         time.sleep(0.4)
-        with idle_lock:
-            robot_state['mode'] = 'idle'
+        with motion_lock:
+            if robot_state['mode'] == 'fired':
+                set_mode('idle')
 
     threading.Thread(target=return_to_idle, daemon=True).start()
 
 
+# Celebration spin: (body yaw deg, move duration s, hold s). goto_target
+# blocks for the move duration, so each hold runs after its move completes.
+CELEBRATION_KEYFRAMES = (
+    (-30, 0.2, 0.25),   # Rotate left
+    (30, 0.15, 0.2),    # Rotate right (faster)
+    (0, 0.25, 0.3),     # Return to center
+)
+
+
 def handle_bubble_eliminated(data):
     """Bubbles eliminated (correct hit!) - body celebration animation."""
     count = data.get('count', 0)
     color = data.get('colorLabel', 'Unknown')
 
-    print(f"   🤖 [ELIMINATED] {count} {color} bubbles - celebration spin!")
+    logger.info(f"   🤖 [ELIMINATED] {count} {color} bubbles - celebration spin!")
 
-    with idle_lock:
-        robot_state['animating'] = True
-        robot_state['mode'] = 'celebrating'
+    animating.set()
+    with motion_lock:
+        set_mode('celebrating')
 
     # Body spin animation for celebration
     try:
-        # Rotate left
-        goto_body(-30, duration=0.2)
-        time.sleep(0.25)
+        for body_yaw_deg, duration, hold in CELEBRATION_KEYFRAMES:
+            goto_body(body_yaw_deg, duration=duration)
+            time.sleep(hold)
+    except Exception as e:
+        logger.error(f"   ❌ Animation error: {e}")
 
-        # Rotate right (faster)
-        goto_body(30, duration=0.15)
-        time.sleep(0.2)
+    with motion_lock:
+        set_mode('idle')
+    animating.clear()
 
-        # Return to center
-        goto_body(0, duration=0.25)
-        time.sleep(0.3)
-    except Exception as e:
-        print(f"   ❌ Animation error: {e}")
+    logger.info("   ✅ Animation complete - accepting events again")
 
-    with idle_lock:
-        robot_state['animating'] = False
-        robot_state['mode'] = 'idle'
 
-    print("   ✅ Animation complete - accepting events again")
+HANDLERS = {
+    'slingshot_draw': handle_slingshot_draw,
+    'slingshot_fire': handle_slingshot_fire,
+    'bubble_eliminated': handle_bubble_eliminated,
+}
+
+
+# ========================================================================
+# MOTION WORKER - runs queued handlers one at a time
+# ========================================================================
+
+def motion_worker_loop():
+    """Drain the motion queue so handlers never block HTTP requests."""
+    while True:
+        with motion_ready:
+            while not pending_motions:
+                motion_ready.wait()
+            handler, data = pending_motions.popleft()
+        try:
+            handler(data)
+        except Exception as e:
+            logger.error(f"   ❌ Error: {e}")
+
+
+def enqueue_motion(handler, data):
+    """Queue a handler call; returns False if the queue is full.
+
+    A draw replaces a draw still waiting at the tail of the queue, so the
+    robot only follows the latest pull-back position.
+    """
+    with motion_ready:
+        if (handler is handle_slingshot_draw and pending_motions
+                and pending_motions[-1][0] is handle_slingshot_draw):
+            pending_motions[-1] = (handler, data)
+            return True
+        if len(pending_motions) >= MOTION_QUEUE_SIZE:
+            return False
+        pending_motions.append((handler, data))
+        motion_ready.notify()
+    return True
+
+
+motion_thread = threading.Thread(target=motion_worker_loop, daemon=True)
+motion_thread.start()
+logger.info("✅ Motion worker started")
 
 
 # ========================================================================
 # HELPER FUNCTIONS
 # ========================================================================
 
-def add_event(event):
-    recent_events.append(event)
-    if len(recent_events) > MAX_EVENTS:
-        recent_events.pop(0)
+def add_events(events):
+    global history_version
+    if redis_client is None:
+        recent_events.extend(events)
+        history_version = next(history_versions)
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    for event in events:
+        pipe.xadd(EVENTS_STREAM, {'event': orjson.dumps(event)},
+                  maxlen=MAX_EVENTS, approximate=True)
+    pipe.execute()
+
+
+def list_events():
+    if redis_client is None:
+        return list(recent_events)
+    entries = redis_client.xrevrange(EVENTS_STREAM, count=MAX_EVENTS)
+    return [orjson.loads(fields[b'event']) for _, fields in reversed(entries)]
+
+
+def count_events():
+    if redis_client is None:
+        return len(recent_events)
+    return min(redis_client.xlen(EVENTS_STREAM), MAX_EVENTS)
+
+
+def clear_history():
+    global history_version
+    if redis_client is None:
+        recent_events.clear()
+        history_version = next(history_versions)
+    else:
+        redis_client.delete(EVENTS_STREAM)
+
+
+def history_etag():
+    if redis_client is None:
+        # BOOT_ID: a restarted server's v1, v2... never match old tags
+        return f"{BOOT_ID}-v{history_version}"
+    # Stream ids only grow, even across a DELETE
+    latest = redis_client.xrevrange(EVENTS_STREAM, count=1)
+    return latest[0][0].decode() if latest else "empty"
+
+
+def events_after(events, since_id):
+    for i in range(len(events) - 1, -1, -1):
+        if events[i]['id'] == since_id:
+            return events[i + 1:]
+    return events
+
+
+RULE = '=' * 60
+SHORT_RULE = '=' * 20
 
 
 def log_event(event_type, timestamp, data):
-    print(f"\n{'='*60}")
-    print(f"{'='*20} [{event_type.upper()}] {'='*20}")
-    print(f"{'='*60}")
-    print(f"   Time: {timestamp}")
-    print(f"   Data: {json.dumps(data, indent=2, ensure_ascii=False)}")
-    print(f"{'='*60}\n")
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    # One record, so the handler lock is taken once per event
+    logger.debug(
+        f"\n{RULE}\n{SHORT_RULE} [{str(event_type).upper()}] {SHORT_RULE}\n{RULE}\n"
+        f"   Time: {timestamp}\n"
+        f"   Data: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}\n"
+        f"{RULE}\n"
+    )
 
 
 # ========================================================================
 # API ENDPOINTS
 # ========================================================================
 
+# Static parts of frequent responses, encoded once
+HEALTH_PREFIX = b'{"status":"ok","robot":{"connected":true,"mode":"'
+HEALTH_MID = b'"},"eventsReceived":'
+HEALTH_TIMESTAMP = b',"timestamp":"'
+HEALTH_SUFFIX = b'"}'
+CLEARED_BODY = orjson.dumps({'status': 'cleared'})
+
+
+def json_response(body):
+    return app.response_class(body, mimetype='application/json')
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({
-        'status': 'ok',
-        'timestamp': datetime.now().isoformat(),
-        'robot': {
-            'connected': True,
-            'mode': robot_state['mode']
-        },
-        'eventsReceived': len(recent_events)
-    })
+    return json_response(
+        HEALTH_PREFIX + robot_state['mode'].encode()
+        + HEALTH_MID + str(count_events()).encode()
+        + HEALTH_TIMESTAMP + datetime.now().isoformat().encode() + HEALTH_SUFFIX
+    )
 
 
 @app.route('/api/events', methods=['GET'])
 def get_events():
-    return jsonify({'count': len(recent_events), 'events': recent_events})
+    # ?since_id=<id> limits to newer events; unchanged history -> 304
+    etag = history_etag()
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        events = list_events()
+        since_id = request.args.get('since_id')
+        if since_id:
+            events = events_after(events, since_id)
+        response = jsonify({'count': len(events), 'events': events})
+    response.set_etag(etag, weak=True)
+    return response
 
 
 @app.route('/api/events', methods=['DELETE'])
 def clear_events():
-    recent_events.clear()
-    return jsonify({'status': 'cleared'})
+    clear_history()
+    return json_response(CLEARED_BODY)
 
 
-@app.route('/api/events', methods=['POST'])
-def receive_event():
-    body = request.get_json()
-    event_type = body.get('eventType')
-    timestamp = body.get('timestamp')
-    data = body.get('data', {})
-
-    event = {
-        'id': f"{int(datetime.now().timestamp() * 1000)}-{uuid.uuid4().hex[:9]}",
-        'eventType': event_type,
-        'timestamp': timestamp,
-        'data': data,
-        'receivedAt': datetime.now().isoformat()
+def build_event(body, now_ms, received_at):
+    return {
+        'id': f"{now_ms}-{BOOT_ID}-{next(event_ids):x}",
+        'eventType': body.get('eventType'),
+        'timestamp': body.get('timestamp'),
+        'data': body.get('data', {}),
+        'receivedAt': received_at
     }
 
-    add_event(event)
-    log_event(event_type, timestamp, data)
-
-    handlers = {
-        'slingshot_draw': handle_slingshot_draw,
-        'slingshot_fire': handle_slingshot_fire,
-        'bubble_eliminated': handle_bubble_eliminated,
-    }
 
+def dispatch_event(event):
+    """Queue the handler for an event: returns 'received', 'ignored' or 'dropped'."""
     # Skip events if busy animating (body spin)
-    if robot_state['animating']:
-        print(f"   ⏸️  Animation in progress - event ignored")
-        return jsonify({'status': 'ignored', 'reason': 'animating'})
+    if animating.is_set():
+        logger.warning(f"   ⏸️  Animation in progress - event ignored")
+        return 'ignored'
+
+    handler = HANDLERS.get(event['eventType'])
+    if handler and not enqueue_motion(handler, event['data']):
+        logger.warning(f"   ⚠️ Motion queue full - event dropped")
+        return 'dropped'
+    return 'received'
+
+
+def process_events(bodies):
+    """Record, log and dispatch raw event payloads; returns (event, status) pairs."""
+    # One clock read per request, shared by every event in a batch
+    now_ns = time.time_ns()
+    now_ms = now_ns // 1_000_000
+    # Always microsecond precision, matching datetime.now().isoformat()
+    received_at = datetime.fromtimestamp(now_ns // 1_000_000_000).replace(
+        microsecond=now_ns // 1000 % 1_000_000).isoformat(timespec='microseconds')
+    events = [build_event(body, now_ms, received_at) for body in bodies]
+    add_events(events)
+
+    results = []
+    for event in events:
+        log_event(event['eventType'], event['timestamp'], event['data'])
+        results.append((event, dispatch_event(event)))
+    return results
 
-    handler = handlers.get(event_type)
-    if handler:
-        try:
-            handler(data)
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
 
+@app.route('/api/events', methods=['POST'])
+def receive_event():
+    body = request.get_json()
+    [(event, status)] = process_events([body])
+
+    if status == 'ignored':
+        return jsonify({'status': 'ignored', 'reason': 'animating'})
+    if status == 'dropped':
+        return jsonify({'status': 'dropped', 'reason': 'motion queue full'}), 429
     return jsonify({'status': 'received', 'eventId': event['id']})
 
 
+@app.route('/api/events/batch', methods=['POST'])
+def receive_events_batch():
+    body = request.get_json(cache=False)
+    bodies = body.get('events') if isinstance(body, dict) else None
+    if not isinstance(bodies, list) or not all(isinstance(b, dict) for b in bodies):
+        return jsonify({'error': "expected a JSON object with an 'events' list"}), 400
+    if len(bodies) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'batch too large (max {MAX_BATCH_SIZE} events)'}), 413
+
+    results = process_events(bodies)
+    statuses = [status for _, status in results]
+    return jsonify({
+        'processed': len(results),
+        'failed': statuses.count('dropped'),
+        'ignored': statuses.count('ignored'),
+        'ids': [event['id'] for event, _ in results]
+    })
+
+
 # ========================================================================
 # MAIN
 # ========================================================================
@@ -321,7 +668,10 @@ if __name__ == '__main__':
 """)
 
     try:
-        app.run(host='0.0.0.0', port=PORT, debug=True, use_reloader=False)
+        if DEBUG:
+            app.run(host='0.0.0.0', port=PORT, debug=True, use_reloader=False)
+        else:
+            serve(app, host='0.0.0.0', port=PORT, threads=THREADS)
     finally:
         idle_thread_running = False
         print("\n✅ Server stopped")